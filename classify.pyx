@@ -0,0 +1,97 @@
+# cython: language_level=3
+"""Compiled SMTP response classifier for very large enumerations.
+
+Same contract as classify_response in smtpx.py: takes one raw reply and
+returns 0 (invalid user), 1 (valid) or 2 (ambiguous). The scan runs as plain
+C byte loops with the GIL released. Build in place with:
+
+    python setup.py build_ext --inplace
+
+smtpx.py falls back to its pure-Python implementation when this extension
+has not been built, so the extension is strictly optional.
+"""
+
+from libc.stdlib cimport malloc, free
+
+DEF NKEYWORDS = 10
+
+# Markers of a "user does not exist" reply, mirroring INVALID_RE in smtpx.py.
+cdef const unsigned char* KEYWORDS[NKEYWORDS]
+cdef Py_ssize_t KEYWORD_LENS[NKEYWORDS]
+
+KEYWORDS[0] = b"cannot";    KEYWORD_LENS[0] = 6
+KEYWORDS[1] = b"invalid";   KEYWORD_LENS[1] = 7
+KEYWORDS[2] = b"not found"; KEYWORD_LENS[2] = 9
+KEYWORDS[3] = b"unknown";   KEYWORD_LENS[3] = 7
+KEYWORDS[4] = b"unable";    KEYWORD_LENS[4] = 6
+KEYWORDS[5] = b"disabled";  KEYWORD_LENS[5] = 8
+KEYWORDS[6] = b"denied";    KEYWORD_LENS[6] = 6
+KEYWORDS[7] = b"reject";    KEYWORD_LENS[7] = 6
+KEYWORDS[8] = b"fail";      KEYWORD_LENS[8] = 4
+KEYWORDS[9] = b"error";     KEYWORD_LENS[9] = 5
+
+cdef const unsigned char* K_OK = b"ok"
+cdef const unsigned char* K_USER = b"user"
+cdef const unsigned char* K_NOT_FOUND = b"not found"
+
+cdef int contains(const unsigned char* hay, Py_ssize_t n,
+                  const unsigned char* needle, Py_ssize_t m) noexcept nogil:
+    cdef Py_ssize_t i, j
+    if m > n:
+        return 0
+    for i in range(n - m + 1):
+        j = 0
+        while j < m and hay[i + j] == needle[j]:
+            j += 1
+        if j == m:
+            return 1
+    return 0
+
+cdef int classify(const unsigned char* resp, Py_ssize_t n) noexcept nogil:
+    cdef int code = 0
+    cdef Py_ssize_t i, m
+    cdef unsigned char c
+    cdef unsigned char* text
+    cdef int outcome = 0
+    cdef int k
+
+    if n < 3:
+        return 0
+    for i in range(3):
+        c = resp[i]
+        if c < 0x30 or c > 0x39:
+            code = 0
+            break
+        code = code * 10 + (c - 0x30)
+
+    # Lowercase the reply text once so keyword scans are case-insensitive.
+    m = n - 3
+    text = <unsigned char*> malloc(m if m > 0 else 1)
+    if text == NULL:
+        return 0
+    for i in range(m):
+        c = resp[3 + i]
+        if 0x41 <= c <= 0x5a:
+            c += 0x20
+        text[i] = c
+
+    if 250 <= code <= 252 or (200 <= code < 300 and contains(text, m, K_OK, 2)):
+        outcome = 1
+        for k in range(NKEYWORDS):
+            if contains(text, m, KEYWORDS[k], KEYWORD_LENS[k]):
+                outcome = 0
+                break
+    elif code == 550 and contains(text, m, K_USER, 4) and not contains(text, m, K_NOT_FOUND, 9):
+        outcome = 2
+
+    free(text)
+    return outcome
+
+cpdef int classify_response(bytes result):
+    """Classify a raw SMTP reply: 0 = invalid user, 1 = valid, 2 = ambiguous."""
+    cdef const unsigned char* resp = result
+    cdef Py_ssize_t n = len(result)
+    cdef int outcome
+    with nogil:
+        outcome = classify(resp, n)
+    return outcome
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""Build script for the optional compiled response classifier.
+
+    python setup.py build_ext --inplace
+
+Requires Cython; smtpx.py works without the extension, it just uses the
+pure-Python classifier instead.
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="smtpx-classify",
+    ext_modules=cythonize("classify.pyx"),
+)
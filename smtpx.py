@@ -1,441 +1,586 @@
-#!/usr/bin/env python3
-
-# -*- coding: utf-8 -*-
-
-"""
-
-Author: Cyb3rtr0n @2025
-
-SMTPX – Ultimate SMTP User Enumeration Tool
---------------------------------------------
-
-SMTPX is a next-generation SMTP user enumeration tool designed to outperform
-traditional tools like `smtp-user-enum` by a wide margin. It is optimized for
-speed, accuracy, and stealth.
-
-Features:
-- Multi-method enumeration: VRFY, EXPN, RCPT TO
-- Supports single users or bulk user lists
-- Optional domain appending for emails
-- Automatic retries for failed connections
-- Multithreaded enumeration for efficiency
-- Live dynamic console UI using Rich
-- Verbose and debug modes for troubleshooting
-- Accurate detection of valid users even with ambiguous SMTP responses
-
-Usage:
-------
-Single user check:
-    ./smtpx.py -t smtp.example.com -u alice -M VRFY
-
-Bulk userlist:
-    ./smtpx.py -t smtp.example.com -U examples/userlist.txt -M RCPT -f attacker@example.com -D example.com -T 10
-
-Verbose + Debug mode:
-    ./smtpx.py -t smtp.example.com -U examples/userlist.txt -v -d
-
-Options:
---------
--t, --target      Target SMTP server (required)
--U, --userlist    Path to a file containing usernames
--u, --user        Single username to test
--M, --method      Enumeration method: VRFY (default), EXPN, RCPT
--f, --from-addr   MAIL FROM address (used in RCPT mode, default: user@example.com)
--D, --domain      Domain to append to usernames
--p, --port        SMTP port (default: 25)
--T, --threads     Number of threads (default: 5)
--w, --wait        Timeout in seconds (default: 10)
--v, --verbose     Verbose output
--d, --debug       Debug output for troubleshooting
--h, --help        Show help message
-
-Notes:
-------
-- Handles timeouts, connection errors, and ambiguous server responses
-- Retries failed users automatically with adjusted settings
-- Requires Python 3.8+ and Rich library
-"""
-
-# ------------------- IMPORTS -------------------
-
-import socket
-import argparse
-import sys
-import time
-import threading
-import random
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from rich.console import Console, Group
-from rich.live import Live
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
-
-# ------------------- GLOBALS -------------------
-
-console = Console()
-valid_users = []
-current_user = ""
-start_time = 0
-debug_output = []
-lock = threading.Lock()
-failed_users = []
-
-def check_user(smtp_server, username, method, mail_from, domain, port, timeout, debug, verbose, retry_count=0):
-    """Check if a username exists on the SMTP server."""
-    global valid_users, debug_output, failed_users
-    
-    if domain:
-        test_username = f"{username}@{domain}"
-    else:
-        test_username = username
-        
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        
-        try:
-            sock.connect((smtp_server, port))
-        except socket.timeout:
-            if debug:
-                with lock:
-                    debug_output.append(f"[DEBUG] Connection timeout for {username}")
-            if retry_count < 2:
-                with lock:
-                    failed_users.append((username, retry_count + 1))
-            return False
-        except Exception as e:
-            if debug:
-                with lock:
-                    debug_output.append(f"[DEBUG] Connection error for {username}: {str(e)}")
-            if retry_count < 2:
-                with lock:
-                    failed_users.append((username, retry_count + 1))
-            return False
-            
-        try:
-            banner = sock.recv(1024).decode()
-            if debug:
-                with lock:
-                    debug_output.append(f"[DEBUG] Banner: {banner.strip()}")
-        except socket.timeout:
-            if debug:
-                with lock:
-                    debug_output.append(f"[DEBUG] Banner timeout for {username}")
-            sock.close()
-            if retry_count < 2:
-                with lock:
-                    failed_users.append((username, retry_count + 1))
-            return False
-        
-        try:
-            sock.send(b"HELO test\r\n")
-            helo_response = sock.recv(1024).decode()
-            if debug:
-                with lock:
-                    debug_output.append(f"[DEBUG] HELO response: {helo_response.strip()}")
-        except socket.timeout:
-            if debug:
-                with lock:
-                    debug_output.append(f"[DEBUG] HELO timeout for {username}")
-            sock.close()
-            if retry_count < 2:
-                with lock:
-                    failed_users.append((username, retry_count + 1))
-            return False
-        
-        if method == "VRFY":
-            try:
-                sock.send(f"VRFY {test_username}\r\n".encode())
-                result = sock.recv(1024).decode()
-                if debug:
-                    with lock:
-                        debug_output.append(f"[DEBUG] VRFY response: {result.strip()}")
-            except socket.timeout:
-                if debug:
-                    with lock:
-                        debug_output.append(f"[DEBUG] VRFY timeout for {username}")
-                sock.close()
-                if retry_count < 2:
-                    with lock:
-                        failed_users.append((username, retry_count + 1))
-                return False
-                
-        elif method == "EXPN":
-            try:
-                sock.send(f"EXPN {test_username}\r\n".encode())
-                result = sock.recv(1024).decode()
-                if debug:
-                    with lock:
-                        debug_output.append(f"[DEBUG] EXPN response: {result.strip()}")
-            except socket.timeout:
-                if debug:
-                    with lock:
-                        debug_output.append(f"[DEBUG] EXPN timeout for {username}")
-                sock.close()
-                if retry_count < 2:
-                    with lock:
-                        failed_users.append((username, retry_count + 1))
-                return False
-                
-        elif method == "RCPT":
-            try:
-                sock.send(f"MAIL FROM: {mail_from}\r\n".encode())
-                mail_response = sock.recv(1024).decode()
-                if debug:
-                    with lock:
-                        debug_output.append(f"[DEBUG] MAIL FROM response: {mail_response.strip()}")
-                    
-                sock.send(f"RCPT TO: {test_username}\r\n".encode())
-                result = sock.recv(1024).decode()
-                if debug:
-                    with lock:
-                        debug_output.append(f"[DEBUG] RCPT TO response: {result.strip()}")
-            except socket.timeout:
-                if debug:
-                    with lock:
-                        debug_output.append(f"[DEBUG] RCPT timeout for {username}")
-                sock.close()
-                if retry_count < 2:
-                    with lock:
-                        failed_users.append((username, retry_count + 1))
-                return False
-        else:
-            if debug:
-                with lock:
-                    debug_output.append(f"[red]Unknown method: {method}[/red]")
-            sock.close()
-            return False
-
-        try:
-            sock.send(b"QUIT\r\n")
-            sock.close()
-        except:
-            pass
-
-        response_code = result[:3]
-        response_text = result[3:].lower()
-        
-        if (response_code in ["250", "251", "252"] or 
-            (response_code.startswith("2") and "ok" in response_text)):
-            
-            invalid_indicators = [
-                "cannot", "invalid", "not found", "unknown", "unable", 
-                "disabled", "denied", "reject", "fail", "error"
-            ]
-            
-            if not any(indicator in response_text for indicator in invalid_indicators):
-                valid_username = test_username if domain else username
-                with lock:
-                    if valid_username not in valid_users:
-                        valid_users.append(valid_username)
-                        if verbose:
-                            debug_output.append(f"[green]Found valid user: {valid_username}[/green]")
-                        return True
-        
-        elif response_code == "550" and "user" in response_text and "not found" not in response_text:
-            if debug:
-                with lock:
-                    debug_output.append(f"[yellow]Ambiguous response for {username}: {result.strip()}[/yellow]")
-                
-    except socket.timeout:
-        if debug:
-            with lock:
-                debug_output.append(f"[DEBUG] General timeout checking user: {username}")
-        if retry_count < 2:
-            with lock:
-                failed_users.append((username, retry_count + 1))
-    except Exception as e:
-        if debug:
-            with lock:
-                debug_output.append(f"[DEBUG] Error checking user {username}: {str(e)}")
-        if retry_count < 2:
-            with lock:
-                failed_users.append((username, retry_count + 1))
-    return False
-
-def main():
-    global start_time, debug_output, current_user, failed_users
-    
-    parser = argparse.ArgumentParser(description="SMTP User Enumeration Tool", add_help=False)
-    parser.add_argument("-U", "--userlist", help="Path to user list (required unless using -u)")
-    parser.add_argument("-u", "--user", help="Single username to test")
-    parser.add_argument("-t", "--target", required=True, help="Target SMTP server")
-    parser.add_argument("-M", "--method", default="VRFY", choices=["VRFY", "EXPN", "RCPT"], 
-                       help="Method to use for username guessing (default: VRFY)")
-    parser.add_argument("-f", "--from-addr", default="user@example.com", 
-                       help='MAIL FROM email address. Used only in "RCPT TO" mode (default: user@example.com)')
-    parser.add_argument("-D", "--domain", help="Domain to append to supplied user list to make email addresses")
-    parser.add_argument("-p", "--port", type=int, default=25, help="TCP port on which SMTP service runs (default: 25)")
-    parser.add_argument("-d", "--debug", action="store_true", help="Debugging output")
-    parser.add_argument("-w", "--wait", type=int, default=10, help="Wait a maximum of n seconds for reply (default: 10)")
-    parser.add_argument("-T", "--threads", type=int, default=5, help="Number of threads to use (default: 5)")
-    parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
-    parser.add_argument("-h", "--help", action="store_true", help="Show help message")
-    
-    args = parser.parse_args()
-    
-    if args.help:
-        parser.print_help()
-        sys.exit(0)
-    
-    if not args.userlist and not args.user:
-        console.print("[red]Error: Either -U/--userlist or -u/--user must be specified[/red]")
-        parser.print_help()
-        sys.exit(1)
-    
-    if args.userlist and args.user:
-        console.print("[red]Error: Cannot specify both -U/--userlist and -u/--user[/red]")
-        parser.print_help()
-        sys.exit(1)
-    
-    if args.user:
-        usernames = [args.user]
-    else:
-        try:
-            with open(args.userlist, "r", errors="ignore") as f:
-                usernames = [line.strip() for line in f if line.strip()]
-        except FileNotFoundError:
-            console.print(f"[red]Error: File {args.userlist} not found[/red]")
-            sys.exit(1)
-    
-    total_users = len(usernames)
-    
-    progress = Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}", justify="center"),
-        BarColumn(bar_width=None),
-        TextColumn("{task.completed}/{task.total}", justify="center"),
-        expand=False
-    )
-    task = progress.add_task("[blue]Enumerating Users[/blue]", total=total_users)
-
-    start_time = time.time()
-    
-    with Live(refresh_per_second=10, console=console) as live:
-        panel_content = Group(
-            progress,
-            f"[cyan]Current user:[/cyan] {current_user}",
-            f"[green]Valid users:[/green] {', '.join(valid_users)}" if valid_users else "[green]Valid users: None[/green]"
-        )
-        live.update(Panel(panel_content, title="[bold cyan]SMTP User Enumeration[/bold cyan]", padding=(0, 2), expand=False))
-        
-        if args.verbose:
-            console.print(f"[cyan]Starting enumeration with method {args.method}[/cyan]")
-            if args.domain:
-                console.print(f"[cyan]Using domain: {args.domain}[/cyan]")
-            console.print(f"[cyan]Target: {args.target}:{args.port}[/cyan]")
-            console.print(f"[cyan]Testing {total_users} users with {args.threads} threads[/cyan]")
-        
-        with ThreadPoolExecutor(max_workers=args.threads) as executor:
-            future_to_user = {
-                executor.submit(
-                    check_user, 
-                    args.target, 
-                    username, 
-                    args.method, 
-                    args.from_addr, 
-                    args.domain, 
-                    args.port, 
-                    args.wait, 
-                    args.debug, 
-                    args.verbose,
-                    0
-                ): username for username in usernames
-            }
-            
-            for future in as_completed(future_to_user):
-                username = future_to_user[future]
-                try:
-                    future.result()
-                except Exception as e:
-                    if args.debug:
-                        with lock:
-                            debug_output.append(f"[DEBUG] Exception for {username}: {str(e)}")
-                
-                progress.update(task, advance=1)
-                
-                panel_content = Group(
-                    progress,
-                    f"[cyan]Current user:[/cyan] {username}",
-                    f"[green]Valid users:[/green] {', '.join(valid_users)}" if valid_users else "[green]Valid users: None[/green]"
-                )
-                
-                if debug_output and args.debug:
-                    debug_group = Group(*[f"[yellow]{line}[/yellow]" for line in debug_output[-3:]])
-                    panel_content = Group(panel_content, debug_group)
-                
-                live.update(Panel(panel_content, title="[bold cyan]SMTP User Enumeration[/bold cyan]", padding=(0, 2), expand=False))
-        
-        if failed_users:
-            retry_users = [user for user, count in failed_users]
-            retry_count = len(retry_users)
-            
-            if args.verbose:
-                console.print(f"[yellow]Retrying {retry_count} failed users with slower settings...[/yellow]")
-            
-            progress.update(task, total=total_users + retry_count)
-            
-            retry_threads = max(1, args.threads // 2)
-            retry_timeout = args.wait * 2
-            
-            with ThreadPoolExecutor(max_workers=retry_threads) as executor:
-                future_to_user = {
-                    executor.submit(
-                        check_user, 
-                        args.target, 
-                        username, 
-                        args.method, 
-                        args.from_addr, 
-                        args.domain, 
-                        args.port, 
-                        retry_timeout,
-                        args.debug, 
-                        args.verbose,
-                        1
-                    ): username for username in retry_users
-                }
-                
-                for future in as_completed(future_to_user):
-                    username = future_to_user[future]
-                    try:
-                        future.result()
-                    except Exception as e:
-                        if args.debug:
-                            with lock:
-                                debug_output.append(f"[DEBUG] Exception during retry for {username}: {str(e)}")
-                    
-                    progress.update(task, advance=1)
-                    
-                    panel_content = Group(
-                        progress,
-                        f"[cyan]Current user:[/cyan] {username} (retry)",
-                        f"[green]Valid users:[/green] {', '.join(valid_users)}" if valid_users else "[green]Valid users: None[/green]"
-                    )
-                    
-                    if debug_output and args.debug:
-                        debug_group = Group(*[f"[yellow]{line}[/yellow]" for line in debug_output[-3:]])
-                        panel_content = Group(panel_content, debug_group)
-                    
-                    live.update(Panel(panel_content, title="[bold cyan]SMTP User Enumeration[/bold cyan]", padding=(0, 2), expand=False))
-    
-    end_time = time.time()
-    time_taken = end_time - start_time
-
-    console.print(f"\n[bold cyan]Enumeration Complete (Time taken: {time_taken:.2f} seconds)[/bold cyan]")
-    
-    if args.debug and debug_output:
-        console.print("\n[bold yellow]Debug Output:[/bold yellow]")
-        for line in debug_output:
-            console.print(line)
-    
-    if failed_users:
-        console.print(f"[yellow]{len(failed_users)} users failed after retries[/yellow]")
-    
-    if valid_users:
-        console.print(f"[bold yellow]Valid users found:[/bold yellow] {', '.join(valid_users)}")
-    else:
-        console.print("[bold yellow]No valid users found.[/bold yellow]")
-
-if __name__ == "__main__":
-    main()
-
+#!/usr/bin/env python3
+
+# -*- coding: utf-8 -*-
+
+"""
+
+Author: Cyb3rtr0n @2025
+
+SMTPX – Ultimate SMTP User Enumeration Tool
+--------------------------------------------
+
+SMTPX is a next-generation SMTP user enumeration tool designed to outperform
+traditional tools like `smtp-user-enum` by a wide margin. It is optimized for
+speed, accuracy, and stealth.
+
+Features:
+- Multi-method enumeration: VRFY, EXPN, RCPT TO
+- Supports single users or bulk user lists
+- Optional domain appending for emails
+- Automatic retries for failed connections
+- Asynchronous enumeration with connection reuse for efficiency
+- Live dynamic console UI using Rich
+- Verbose and debug modes for troubleshooting
+- Accurate detection of valid users even with ambiguous SMTP responses
+
+Usage:
+------
+Single user check:
+    ./smtpx.py -t smtp.example.com -u alice -M VRFY
+
+Bulk userlist:
+    ./smtpx.py -t smtp.example.com -U examples/userlist.txt -M RCPT -f attacker@example.com -D example.com -T 10
+
+Verbose + Debug mode:
+    ./smtpx.py -t smtp.example.com -U examples/userlist.txt -v -d
+
+Options:
+--------
+-t, --target      Target SMTP server (required)
+-U, --userlist    Path to a file containing usernames
+-u, --user        Single username to test
+-M, --method      Enumeration method: VRFY (default), EXPN, RCPT
+-f, --from-addr   MAIL FROM address (used in RCPT mode, default: user@example.com)
+-D, --domain      Domain to append to usernames
+-p, --port        SMTP port (default: 25)
+-T, --threads     Number of concurrent connections (default: 5)
+-w, --wait        Timeout in seconds (default: 10)
+-v, --verbose     Verbose output
+-d, --debug       Debug output for troubleshooting
+-h, --help        Show help message
+
+Notes:
+------
+- Handles timeouts, connection errors, and ambiguous server responses
+- Retries failed users automatically with adjusted settings
+- All probe sockets are multiplexed from a single thread by the asyncio
+  event loop (epoll/kqueue via selectors), so -T scales to hundreds of
+  concurrent connections without per-thread stacks or context switches
+- Requires Python 3.8+ and Rich library
+"""
+
+# ------------------- IMPORTS -------------------
+
+import asyncio
+import argparse
+import itertools
+import os
+import re
+import socket
+import struct
+import sys
+import time
+from collections import deque
+from rich.console import Console, Group
+from rich.live import Live
+from rich.panel import Panel
+from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
+
+# ------------------- GLOBALS -------------------
+
+# All enumeration state below is mutated only from coroutines on the single
+# event-loop thread, so plain appends are safe without any locking.
+console = Console()
+valid_users = set()
+valid_users_str = ""
+current_user = ""
+start_time = 0
+debug_output = []
+recent_debug = deque(maxlen=3)
+failed_count = 0
+pinned_cpu = None
+
+# In-worker retry policy for connection-level failures: back off
+# RETRY_BACKOFF * 2**attempt seconds and reconnect with a doubled timeout,
+# for up to MAX_RETRIES consecutive attempts that probe nothing at all.
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.25
+
+# Max commands sent back-to-back on a pipelined connection, kept small to
+# stay under the server's input buffer (RFC 2920 recommends modest groups).
+PIPELINE_CHUNK = 20
+
+# Markers of a "user does not exist" reply, matched in a single C-level scan
+# instead of one str.__contains__ pass per keyword.
+INVALID_RE = re.compile(
+    rb"cannot|invalid|not found|unknown|unable|disabled|denied|reject|fail|error",
+    re.IGNORECASE
+)
+
+# Pre-encoded commands shared by every connection.
+EHLO_CMD = b"EHLO test\r\n"
+RSET_CMD = b"RSET\r\n"
+
+# SO_LINGER {l_onoff=1, l_linger=0}: closing the socket sends an immediate
+# RST instead of a graceful FIN handshake, so probe connections leave no
+# TIME_WAIT entries behind (ephemeral ports run out fast on big sweeps).
+LINGER_RST = struct.pack("ii", 1, 0)
+
+def iter_users(path):
+    """Yield stripped, non-empty usernames from a wordlist one at a time.
+
+    Streaming keeps memory bounded for multi-million-entry wordlists instead
+    of materializing one str per line before the first probe is sent.
+    """
+    with open(path, "r", errors="ignore") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+def log_debug(line):
+    """Record a debug line for the final dump and the live panel tail.
+
+    recent_debug is a fixed-size deque so the panel can render the last few
+    lines without slicing the (potentially huge) debug_output list per frame.
+    """
+    debug_output.append(line)
+    recent_debug.append(line)
+
+def classify_response(result):
+    """Classify a raw SMTP reply: 0 = invalid user, 1 = valid, 2 = ambiguous."""
+    try:
+        code = int(result[:3])
+    except ValueError:
+        code = 0
+    response_text = result[3:].lower()
+
+    if 250 <= code <= 252 or (200 <= code < 300 and b"ok" in response_text):
+        if not INVALID_RE.search(response_text):
+            return 1
+
+    elif code == 550 and b"user" in response_text and b"not found" not in response_text:
+        return 2
+
+    return 0
+
+# Optional compiled fast path for very large enumerations; build it with
+# `python setup.py build_ext --inplace` (see classify.pyx). The pure-Python
+# implementation above is used whenever the extension isn't present.
+try:
+    from classify import classify_response
+except ImportError:
+    pass
+
+def record_result(username, test_username, result, debug, verbose):
+    """Record the classification of a probe response for one user."""
+    global valid_users_str
+
+    outcome = classify_response(result)
+
+    if outcome == 1:
+        if test_username not in valid_users:
+            valid_users.add(test_username)
+            valid_users_str = f"{valid_users_str}, {test_username}" if valid_users_str else test_username
+            if verbose:
+                log_debug(f"[green]Found valid user: {test_username}[/green]")
+            return True
+
+    elif outcome == 2 and debug:
+        decoded = result.decode("ascii", "replace").strip()
+        log_debug(f"[yellow]Ambiguous response for {username}: {decoded}[/yellow]")
+
+    return False
+
+async def read_reply(reader, timeout):
+    """Read one (possibly multi-line) SMTP reply from the server as raw bytes.
+
+    Keeps reading lines until the final one, i.e. a line whose 3-digit code
+    is followed by a space rather than a dash (b"250 " vs b"250-").
+    """
+    lines = []
+    while True:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        lines.append(line)
+        if not (len(line) >= 4 and line[:3].isdigit() and line[3:4] == b"-"):
+            break
+    return b"".join(lines)
+
+async def probe_batch(smtp_server, users, method, mail_from, domain, port, timeout, debug, verbose, on_user_done=None):
+    """Probe a batch of usernames over a single reused SMTP connection.
+
+    Drives probe_once over the batch; on a connection-level failure it backs
+    off exponentially, reconnects with a doubled timeout and resumes from the
+    first unprobed username, so slow-server tail latency is absorbed in place
+    instead of being deferred to a separate retry pass. The retry budget only
+    counts consecutive attempts that probe nothing — any progress resets it —
+    and exhausting it abandons just the head username, so a poison entry or a
+    server that drops the connection every N probes (e.g. Postfix's
+    smtpd_hard_error_limit) can never discard the rest of the slice.
+    """
+    global failed_count
+
+    remaining = list(users)
+    attempt = 0
+    while remaining:
+        probed = await probe_once(smtp_server, remaining, method, mail_from, domain,
+                                  port, timeout * 2 ** attempt, debug, verbose, on_user_done)
+        if probed:
+            remaining = remaining[probed:]
+            attempt = 0
+            continue
+
+        attempt += 1
+        if attempt > MAX_RETRIES:
+            username = remaining.pop(0)
+            if debug:
+                log_debug(f"[DEBUG] Giving up on {username} after {MAX_RETRIES} retries")
+            failed_count += 1
+            if on_user_done:
+                on_user_done(username)
+            attempt = 0
+        else:
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+
+async def probe_once(smtp_server, users, method, mail_from, domain, port, timeout, debug, verbose, on_user_done=None):
+    """Probe usernames over one SMTP connection and return how many completed.
+
+    Connects and sends EHLO once, then issues one probe per username on the
+    same socket (with RSET between RCPT transactions), so per-user cost is a
+    single round trip instead of a full TCP + banner + EHLO handshake. On any
+    connection-level error the count of completed users is returned so the
+    caller can retry the rest.
+    """
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(smtp_server, port), timeout)
+    except asyncio.TimeoutError:
+        if debug:
+            log_debug(f"[DEBUG] Connection timeout for batch of {len(users)} users")
+        return 0
+    except Exception as e:
+        if debug:
+            log_debug(f"[DEBUG] Connection error for batch of {len(users)} users: {str(e)}")
+        return 0
+
+    # Disable Nagle so each short command goes out immediately instead of
+    # stalling up to 40ms against the server's delayed ACKs, and enable
+    # keepalive so a reused connection survives idle periods.
+    sock = writer.get_extra_info("socket")
+    if sock is not None:
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, LINGER_RST)
+            if pinned_cpu is not None:
+                # Steer kernel RX for this socket to the core the event loop
+                # is pinned to, keeping packet data warm in its cache.
+                sock.setsockopt(socket.SOL_SOCKET,
+                                getattr(socket, "SO_INCOMING_CPU", 70), pinned_cpu)
+        except OSError:
+            pass
+
+    try:
+        banner = await read_reply(reader, timeout)
+        if debug:
+            log_debug(f"[DEBUG] Banner: {banner.decode('ascii', 'replace').strip()}")
+
+        writer.write(EHLO_CMD)
+        await writer.drain()
+        ehlo_response = await read_reply(reader, timeout)
+        if debug:
+            log_debug(f"[DEBUG] EHLO response: {ehlo_response.decode('ascii', 'replace').strip()}")
+    except (asyncio.TimeoutError, ConnectionError) as e:
+        if debug:
+            log_debug(f"[DEBUG] Session setup failed for batch of {len(users)} users: {str(e)}")
+        writer.close()
+        return 0
+
+    # RFC 2920: if the server advertises PIPELINING we can batch commands
+    # into a single send and read the replies back-to-back, collapsing K
+    # probes into one round trip instead of K.
+    pipelining = any(
+        line.strip().upper().startswith(b"PIPELINING")
+        for line in ehlo_response.replace(b"250-", b"").replace(b"250 ", b"").splitlines()
+    )
+
+    # Encode every command for this batch up front; the probe loops below
+    # then push pre-built bytes and never touch str formatting again.
+    tests = [f"{u}@{domain}" for u in users] if domain else users
+    if method == "RCPT":
+        mail_cmd = f"MAIL FROM: {mail_from}\r\n".encode()
+        probe_cmds = [f"RCPT TO: {t}\r\n".encode() for t in tests]
+    else:
+        probe_cmds = [f"{method} {t}\r\n".encode() for t in tests]
+
+    if pipelining and method in ("VRFY", "EXPN", "RCPT"):
+        for start in range(0, len(users), PIPELINE_CHUNK):
+            chunk = users[start:start + PIPELINE_CHUNK]
+
+            if method == "RCPT":
+                buf = b"".join(
+                    mail_cmd + cmd + RSET_CMD for cmd in probe_cmds[start:start + len(chunk)]
+                )
+            else:
+                buf = b"".join(probe_cmds[start:start + len(chunk)])
+
+            try:
+                writer.write(buf)
+                await writer.drain()
+            except Exception as e:
+                if debug:
+                    log_debug(f"[DEBUG] Pipelined send failed: {str(e)}")
+                writer.close()
+                return start
+
+            for offset, username in enumerate(chunk):
+                test_username = tests[start + offset]
+                try:
+                    if method == "RCPT":
+                        mail_response = await read_reply(reader, timeout)
+                        result = await read_reply(reader, timeout)
+                        rset_response = await read_reply(reader, timeout)
+                    else:
+                        result = await read_reply(reader, timeout)
+                    if debug:
+                        log_debug(f"[DEBUG] {method} response: {result.decode('ascii', 'replace').strip()}")
+                except asyncio.TimeoutError:
+                    if debug:
+                        log_debug(f"[DEBUG] Timeout probing {username}")
+                    writer.close()
+                    return start + offset
+                except Exception as e:
+                    if debug:
+                        log_debug(f"[DEBUG] Error probing {username}: {str(e)}")
+                    writer.close()
+                    return start + offset
+
+                record_result(username, test_username, result, debug, verbose)
+                if on_user_done:
+                    on_user_done(username)
+
+        # No QUIT: the RST close is immediate and we never classify on the
+        # server's goodbye, so the extra round trip buys nothing.
+        writer.close()
+        return len(users)
+
+    for index, username in enumerate(users):
+        test_username = tests[index]
+
+        try:
+            if method in ("VRFY", "EXPN"):
+                writer.write(probe_cmds[index])
+                await writer.drain()
+                result = await read_reply(reader, timeout)
+                if debug:
+                    log_debug(f"[DEBUG] {method} response: {result.decode('ascii', 'replace').strip()}")
+
+            elif method == "RCPT":
+                writer.write(mail_cmd)
+                await writer.drain()
+                mail_response = await read_reply(reader, timeout)
+                if debug:
+                    log_debug(f"[DEBUG] MAIL FROM response: {mail_response.decode('ascii', 'replace').strip()}")
+
+                writer.write(probe_cmds[index])
+                await writer.drain()
+                result = await read_reply(reader, timeout)
+                if debug:
+                    log_debug(f"[DEBUG] RCPT TO response: {result.decode('ascii', 'replace').strip()}")
+
+                writer.write(RSET_CMD)
+                await writer.drain()
+                rset_response = await read_reply(reader, timeout)
+                if debug:
+                    log_debug(f"[DEBUG] RSET response: {rset_response.decode('ascii', 'replace').strip()}")
+            else:
+                if debug:
+                    log_debug(f"[red]Unknown method: {method}[/red]")
+                writer.close()
+                return len(users)
+
+        except asyncio.TimeoutError:
+            if debug:
+                log_debug(f"[DEBUG] Timeout probing {username}")
+            writer.close()
+            return index
+        except Exception as e:
+            if debug:
+                log_debug(f"[DEBUG] Error probing {username}: {str(e)}")
+            writer.close()
+            return index
+
+        record_result(username, test_username, result, debug, verbose)
+        if on_user_done:
+            on_user_done(username)
+
+    writer.close()
+    return len(users)
+
+class StatusPanel:
+    """Lazy renderable for the live display.
+
+    Rich drives __rich_console__ at its own refresh cadence (10 Hz), so the
+    panel is composed a handful of times per second instead of once per
+    completed user, and each frame yields a single flat Panel rather than
+    nested Group trees. Workers only mutate cheap state (current_user,
+    counters) in between.
+    """
+
+    def __init__(self, progress, debug):
+        self.progress = progress
+        self.debug = debug
+
+    def __rich_console__(self, console, options):
+        rows = [
+            self.progress,
+            f"[cyan]Current user:[/cyan] {current_user}",
+            f"[green]Valid users:[/green] {valid_users_str}" if valid_users_str else "[green]Valid users: None[/green]"
+        ]
+
+        if self.debug and recent_debug:
+            rows.extend(f"[yellow]{line}[/yellow]" for line in recent_debug)
+
+        yield Panel(Group(*rows), title="[bold cyan]SMTP User Enumeration[/bold cyan]", padding=(0, 2), expand=False)
+
+def main():
+    global start_time, debug_output, current_user, pinned_cpu
+
+    # Everything runs on one event-loop thread, so pin the process to a
+    # single allowed core (Linux only); together with SO_INCOMING_CPU on the
+    # probe sockets this keeps kernel RX and the socket code on one cache.
+    if hasattr(os, "sched_getaffinity") and hasattr(os, "sched_setaffinity"):
+        try:
+            pinned_cpu = min(os.sched_getaffinity(0))
+            os.sched_setaffinity(0, {pinned_cpu})
+        except OSError:
+            pinned_cpu = None
+
+    parser = argparse.ArgumentParser(description="SMTP User Enumeration Tool", add_help=False)
+    parser.add_argument("-U", "--userlist", help="Path to user list (required unless using -u)")
+    parser.add_argument("-u", "--user", help="Single username to test")
+    parser.add_argument("-t", "--target", required=True, help="Target SMTP server")
+    parser.add_argument("-M", "--method", default="VRFY", choices=["VRFY", "EXPN", "RCPT"],
+                       help="Method to use for username guessing (default: VRFY)")
+    parser.add_argument("-f", "--from-addr", default="user@example.com",
+                       help='MAIL FROM email address. Used only in "RCPT TO" mode (default: user@example.com)')
+    parser.add_argument("-D", "--domain", help="Domain to append to supplied user list to make email addresses")
+    parser.add_argument("-p", "--port", type=int, default=25, help="TCP port on which SMTP service runs (default: 25)")
+    parser.add_argument("-d", "--debug", action="store_true", help="Debugging output")
+    parser.add_argument("-w", "--wait", type=int, default=10, help="Wait a maximum of n seconds for reply (default: 10)")
+    parser.add_argument("-T", "--threads", type=int, default=5, help="Number of concurrent connections (default: 5)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
+    parser.add_argument("-h", "--help", action="store_true", help="Show help message")
+
+    args = parser.parse_args()
+
+    if args.help:
+        parser.print_help()
+        sys.exit(0)
+
+    if not args.userlist and not args.user:
+        console.print("[red]Error: Either -U/--userlist or -u/--user must be specified[/red]")
+        parser.print_help()
+        sys.exit(1)
+
+    if args.userlist and args.user:
+        console.print("[red]Error: Cannot specify both -U/--userlist and -u/--user[/red]")
+        parser.print_help()
+        sys.exit(1)
+
+    # Resolve the target once up front; workers connect straight to the IP
+    # instead of round-tripping through getaddrinfo on every connection.
+    try:
+        addrinfo = socket.getaddrinfo(args.target, args.port, type=socket.SOCK_STREAM)
+        server_addr = addrinfo[0][4][0]
+    except socket.gaierror as e:
+        console.print(f"[red]Error: Could not resolve {args.target}: {e}[/red]")
+        sys.exit(1)
+
+    if args.user:
+        users_iter = iter([args.user])
+        total_users = 1
+    else:
+        # Cheap counting pre-pass so the progress bar has a total; the
+        # usernames themselves are streamed in bounded windows below.
+        try:
+            with open(args.userlist, "rb") as f:
+                total_users = sum(1 for line in f if line.strip())
+        except FileNotFoundError:
+            console.print(f"[red]Error: File {args.userlist} not found[/red]")
+            sys.exit(1)
+        users_iter = iter_users(args.userlist)
+
+    progress = Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}", justify="center"),
+        BarColumn(bar_width=None),
+        TextColumn("{task.completed}/{task.total}", justify="center"),
+        expand=False
+    )
+    task = progress.add_task("[blue]Enumerating Users[/blue]", total=total_users)
+
+    start_time = time.time()
+
+    status = StatusPanel(progress, args.debug)
+
+    with Live(status, refresh_per_second=10, auto_refresh=True, console=console):
+        if args.verbose:
+            console.print(f"[cyan]Starting enumeration with method {args.method}[/cyan]")
+            if args.domain:
+                console.print(f"[cyan]Using domain: {args.domain}[/cyan]")
+            console.print(f"[cyan]Target: {args.target}:{args.port} ({server_addr})[/cyan]")
+            console.print(f"[cyan]Testing {total_users} users with {args.threads} concurrent connections[/cyan]")
+
+        async def run_pass(users, concurrency, timeout):
+            def user_done(username):
+                global current_user
+                current_user = username
+                progress.update(task, advance=1)
+
+            # Stride the userlist into one near-equal slice per connection;
+            # the pass runs exactly `concurrency` tasks, not one per user.
+            chunks = [users[i::concurrency] for i in range(concurrency)]
+            chunks = [chunk for chunk in chunks if chunk]
+
+            await asyncio.gather(*[
+                probe_batch(
+                    server_addr,
+                    chunk,
+                    args.method,
+                    args.from_addr,
+                    args.domain,
+                    args.port,
+                    timeout,
+                    args.debug,
+                    args.verbose,
+                    user_done
+                ) for chunk in chunks
+            ])
+
+        async def run():
+            # Pull the wordlist through in windows of a few pipeline chunks
+            # per connection, so only the in-flight slice is ever in memory.
+            window_size = args.threads * PIPELINE_CHUNK * 4
+
+            while True:
+                window = list(itertools.islice(users_iter, window_size))
+                if not window:
+                    break
+                await run_pass(window, args.threads, args.wait)
+
+        asyncio.run(run())
+
+    end_time = time.time()
+    time_taken = end_time - start_time
+
+    console.print(f"\n[bold cyan]Enumeration Complete (Time taken: {time_taken:.2f} seconds)[/bold cyan]")
+
+    if args.debug and debug_output:
+        console.print("\n[bold yellow]Debug Output:[/bold yellow]")
+        for line in debug_output:
+            console.print(line)
+
+    if failed_count:
+        console.print(f"[yellow]{failed_count} users failed after retries[/yellow]")
+
+    if valid_users:
+        console.print(f"[bold yellow]Valid users found:[/bold yellow] {', '.join(sorted(valid_users))}")
+    else:
+        console.print("[bold yellow]No valid users found.[/bold yellow]")
+
+if __name__ == "__main__":
+    main()